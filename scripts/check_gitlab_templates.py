@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Check that the built-in GitLab CI emitter matches templates/gitlab/*.yml.j2 byte for byte.
+
+Without a templates override, .gitlab-ci.yml is emitted directly by
+pipeline_generator and the shipped Jinja templates are not read. Run this after
+editing either side to keep them in sync:
+
+    python scripts/check_gitlab_templates.py
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = REPO_ROOT / "templates"
+sys.path.insert(0, str(REPO_ROOT))
+
+from self_deploy.pipeline_generator import _GITLAB_HEADERS, generate_gitlab_ci  # noqa: E402
+from self_deploy.project_scanner import ProjectDescriptor  # noqa: E402
+from self_deploy.template_engine import TEMPLATES_ENV_VAR  # noqa: E402
+
+STACKS = [
+    ("java", "maven"),
+    ("kotlin", "gradle"),
+    ("go", None),
+    ("ts", None),
+    ("python", None),
+    (None, None),
+]
+DETECTED_DIRS = [{}, {"integration-tests": ["integration-tests"]}]
+CI_CONTEXTS = [
+    {},
+    {
+        "docker_image": "registry.example.com/app",
+        "docker_tag": "v1",
+        "sonar_token": "token",
+        "base_image": "custom:latest",
+        "before_script": ["echo one", "echo two"],
+    },
+]
+
+
+def _render(descriptor: ProjectDescriptor, ci_context: dict, templates_dir: str | None):
+    if templates_dir:
+        os.environ[TEMPLATES_ENV_VAR] = templates_dir
+    else:
+        os.environ.pop(TEMPLATES_ENV_VAR, None)
+    return generate_gitlab_ci(descriptor, ci_context)
+
+
+def main() -> int:
+    failures = 0
+    covered = set()
+    for language, build_tool in STACKS:
+        for detected_dirs in DETECTED_DIRS:
+            for ci_context in CI_CONTEXTS:
+                descriptor = ProjectDescriptor(
+                    language=language,
+                    build_tool=build_tool,
+                    additional_metadata={"detected_dirs": detected_dirs},
+                )
+                builtin = _render(descriptor, ci_context, None)
+                jinja = _render(descriptor, ci_context, str(TEMPLATES_DIR))
+                covered.add(builtin.template_used)
+                if jinja.template_used != builtin.template_used or jinja.content != builtin.content:
+                    failures += 1
+                    print(f"MISMATCH {builtin.template_used} ({language}, {build_tool}, {ci_context or 'defaults'})")
+                    sys.stdout.writelines(
+                        difflib.unified_diff(
+                            jinja.content.splitlines(keepends=True),
+                            builtin.content.splitlines(keepends=True),
+                            fromfile=f"jinja:{jinja.template_used}",
+                            tofile="builtin",
+                        )
+                    )
+
+    shipped = {f"gitlab/{path.name}" for path in (TEMPLATES_DIR / "gitlab").glob("*.yml.j2")}
+    for missing in sorted((shipped | set(_GITLAB_HEADERS)) - covered):
+        failures += 1
+        print(f"NOT COVERED {missing}: add it to _GITLAB_HEADERS and STACKS")
+
+    if failures:
+        print(f"{failures} problem(s) found")
+        return 1
+    print(f"OK: {len(covered)} templates match the built-in emitter")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,4 +9,5 @@ __all__ = [
     "pipeline_generator",
     "dockerfile_generator",
     "reporter",
+    "descriptor_cache",
 ]
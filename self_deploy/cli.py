@@ -6,15 +6,21 @@ import argparse
 import json
 import os
 import sys
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
-import yaml
-
+from .descriptor_cache import (
+    load_commit_descriptor,
+    load_descriptor,
+    store_commit_descriptor,
+    store_descriptor,
+)
 from .dockerfile_generator import DockerfileRenderResult, generate_dockerfile
-from .pipeline_generator import PipelineRenderResult, generate_gitlab_ci
+from .pipeline_generator import generate_gitlab_ci_to_file
 from .project_scanner import ProjectDescriptor, scan_project
-from .repo_cloner import clone_repo
+from .repo_cloner import clone_repo, resolve_local_head, resolve_remote_head
 from .reporter import generate_reports
 from .tech_detector import detect_tech
 
@@ -24,17 +30,35 @@ def _load_config(path: Path | None) -> Dict[str, Any]:
         return {}
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
+    resolved = path.resolve()
+    return _load_config_cached(resolved, resolved.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: Path, mtime_ns: int) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as handle:
         if path.suffix.lower() in {".yml", ".yaml"}:
+            import yaml  # deferred: only YAML configs need it
+
             return yaml.safe_load(handle) or {}
         return json.load(handle)
 
 
-def _write_output(path: Path, content: str, overwrite: bool = True) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if path.exists() and not overwrite:
-        return
-    path.write_text(content, encoding="utf-8")
+def _write_output(path: Path, content: str, overwrite: bool = True) -> bool:
+    """Write an artifact into an output directory the caller has already created.
+
+    Returns False when ``overwrite`` is disabled and the file already exists.
+    """
+    data = content.encode("utf-8")
+    if overwrite:
+        path.write_bytes(data)
+        return True
+    try:
+        with open(path, "xb") as handle:
+            handle.write(data)
+    except FileExistsError:
+        return False
+    return True
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -74,10 +98,21 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Path to optional configuration file (YAML or JSON).",
     )
+    generate.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always clone and scan the repository instead of reusing a cached analysis.",
+    )
 
     return parser
 
 
+@lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Return a parser shared across ``main`` calls; parse_args does not mutate it."""
+    return build_parser()
+
+
 def _summarize(descriptor: ProjectDescriptor, generated_files: list[str]) -> str:
     parts = [
         f"Language: {descriptor.language or 'unknown'}",
@@ -113,9 +148,26 @@ def handle_generate(args: argparse.Namespace) -> int:
     if templates_dir_override:
         os.environ.setdefault("SELF_DEPLOY_TEMPLATES_DIR", str(templates_dir_override))
 
-    repo_path = clone_repo(args.repo, args.branch)
-    raw_descriptor = scan_project(repo_path)
-    descriptor = detect_tech(raw_descriptor)
+    # Reuse the previous analysis when the remote ref still points at the same commit.
+    # Cached descriptors carry no root_path: a ref-cache hit has no clone to point at.
+    commit = None if args.no_cache else resolve_remote_head(args.repo, args.branch)
+    descriptor = load_descriptor(args.repo, args.branch, commit) if commit else None
+    if descriptor is None:
+        repo_path = clone_repo(args.repo, args.branch)
+        # The cloned commit still identifies the tree when the ref could not be resolved remotely
+        # or the same commit was already analysed through another ref.
+        head = None if args.no_cache else resolve_local_head(repo_path)
+        descriptor = load_commit_descriptor(head) if head else None
+        if descriptor is not None:
+            descriptor = replace(descriptor, root_path=repo_path)
+        else:
+            raw_descriptor = scan_project(repo_path)
+            descriptor = detect_tech(raw_descriptor)
+            if head:
+                store_commit_descriptor(head, descriptor)
+        # The ref may have moved between ls-remote and the clone; only cache what was analysed.
+        if commit and head == commit:
+            store_descriptor(args.repo, args.branch, commit, descriptor)
 
     warnings: list[str] = []
     generated_files: list[str] = []
@@ -127,9 +179,8 @@ def handle_generate(args: argparse.Namespace) -> int:
     if not descriptor.tests:
         warnings.append("No tests detected; consider adding a test suite.")
 
-    pipeline_result: PipelineRenderResult = generate_gitlab_ci(descriptor, ci_context)
     gitlab_ci_path = output_dir / ".gitlab-ci.yml"
-    _write_output(gitlab_ci_path, pipeline_result.content)
+    ci_template = generate_gitlab_ci_to_file(descriptor, ci_context, gitlab_ci_path)
     generated_files.append(str(gitlab_ci_path))
 
     dockerfile_result: DockerfileRenderResult | None = None
@@ -145,29 +196,26 @@ def handle_generate(args: argparse.Namespace) -> int:
 
     sonar_content = _generate_sonar_properties(descriptor, ci_context)
     sonar_path = output_dir / "sonar-project.properties"
-    existed_before = sonar_path.exists()
-    _write_output(sonar_path, sonar_content, overwrite=False)
-    if not existed_before:
+    # Written up front: whether it already existed decides if it is listed as generated.
+    if _write_output(sonar_path, sonar_content, overwrite=False):
         generated_files.append(str(sonar_path))
 
-    report_files = [str(output_dir / "report.json"), str(output_dir / "report.md")]
-
+    generated_files.extend([str(output_dir / "report.json"), str(output_dir / "report.md")])
     generate_reports(
         output_dir=output_dir,
         descriptor=descriptor,
-        ci_template=pipeline_result.template_used,
+        ci_template=ci_template,
         dockerfile_template=dockerfile_template_used,
-        generated_files=generated_files + report_files,
+        generated_files=generated_files,
         warnings=warnings,
     )
-    generated_files.extend(report_files)
 
     print(_summarize(descriptor, generated_files))
     return 0
 
 
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
+    parser = _get_parser()
     args = parser.parse_args(argv)
     if args.command == "generate":
         try:
@@ -0,0 +1,99 @@
+"""On-disk cache of detected project descriptors.
+
+Entries are keyed either by repository and ref (validated against the commit the
+ref points to) or directly by the commit SHA of a cloned tree. Entries record the cache format
+and tool version, so upgrading self-deploy invalidates them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from .project_scanner import ProjectDescriptor
+
+CACHE_ENV_VAR = "SELF_DEPLOY_CACHE_DIR"
+# Bump whenever scanning or detection changes what a descriptor contains.
+CACHE_SCHEMA = 2
+
+
+@lru_cache(maxsize=1)
+def _cache_version() -> str:
+    from importlib import metadata  # deferred: only cache lookups need the installed version
+
+    try:
+        tool_version = metadata.version("self-deploy")
+    except metadata.PackageNotFoundError:
+        tool_version = "unknown"
+    return f"{CACHE_SCHEMA}:{tool_version}"
+
+
+def cache_dir() -> Path:
+    """Resolve the cache directory, overridable via env var and honouring XDG_CACHE_HOME."""
+    override = os.environ.get(CACHE_ENV_VAR)
+    if override:
+        return Path(override).expanduser()
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "self-deploy"
+
+
+def _cache_path(repo_url: str, branch: Optional[str]) -> Path:
+    key = hashlib.sha256(f"{repo_url}\0{branch or ''}".encode("utf-8")).hexdigest()
+    return cache_dir() / f"{key}.json"
+
+
+def _commit_path(commit: str) -> Path:
+    return cache_dir() / f"{commit}.descriptor.json"
+
+
+def _read_entry(path: Path, commit: str) -> Optional[ProjectDescriptor]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("version") != _cache_version() or data.get("commit") != commit:
+            return None
+        return ProjectDescriptor(**data["descriptor"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_entry(path: Path, commit: str, descriptor: ProjectDescriptor) -> None:
+    # root_path names a temporary clone that is gone by the next run, so it is not cached.
+    entry = {
+        "version": _cache_version(),
+        "commit": commit,
+        "descriptor": asdict(replace(descriptor, root_path="")),
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entry), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def load_descriptor(repo_url: str, branch: Optional[str], commit: str) -> Optional[ProjectDescriptor]:
+    """Return the cached descriptor if it was produced for the same commit, else None."""
+    return _read_entry(_cache_path(repo_url, branch), commit)
+
+
+def store_descriptor(
+    repo_url: str, branch: Optional[str], commit: str, descriptor: ProjectDescriptor
+) -> None:
+    """Persist a descriptor for later runs; cache write failures are ignored."""
+    _write_entry(_cache_path(repo_url, branch), commit, descriptor)
+
+
+def load_commit_descriptor(commit: str) -> Optional[ProjectDescriptor]:
+    """Return the descriptor cached for a cloned tree's commit SHA, regardless of repo or ref."""
+    return _read_entry(_commit_path(commit), commit)
+
+
+def store_commit_descriptor(commit: str, descriptor: ProjectDescriptor) -> None:
+    """Persist a descriptor under the commit SHA it was scanned from."""
+    _write_entry(_commit_path(commit), commit, descriptor)
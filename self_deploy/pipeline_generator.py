@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-
-from jinja2 import TemplateNotFound
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar
 
 from .project_scanner import ProjectDescriptor
-from .template_engine import render_template
+from .template_engine import render_template, stream_template, templates_overridden
 
 
 @dataclass
@@ -20,7 +23,22 @@ class PipelineRenderResult:
     context: Dict[str, Any]
 
 
-STAGES: List[str] = [
+@dataclass(slots=True)
+class Job:
+    """A single GitLab CI job as consumed by the pipeline templates."""
+
+    stage: str
+    script: Sequence[str]
+    needs: Sequence[str] = ()
+    artifacts: Sequence[str] = ()
+    variables: Mapping[str, str] = field(default_factory=dict)
+    image: Optional[str] = None
+    rules: Sequence[Mapping[str, Any]] = ()
+    services: Sequence[str] = ()
+    cache_paths: Sequence[str] = ()
+
+
+STAGES: Tuple[str, ...] = (
     "prepare",
     "lint",
     "test",
@@ -31,133 +49,193 @@ STAGES: List[str] = [
     "push",
     "deploy_staging",
     "deploy_prod",
-]
+)
+
+
+# Overridable through the "ci" section of the config; docker_image_full is derived.
+_CI_DEFAULTS: Mapping[str, str] = MappingProxyType(
+    {
+        "sonar_host": "http://sonarqube:9000",
+        "sonar_token": "$SONAR_TOKEN",
+        "docker_image": "$CI_REGISTRY_IMAGE",
+        "docker_tag": "${CI_COMMIT_SHORT_SHA:-latest}",
+        "registry": "$CI_REGISTRY",
+    }
+)
+
+_INTEGRATION_DIR_RE = re.compile(r"integration|e2e")
+
+_Key = Tuple[str, Optional[str]]
+_T = TypeVar("_T")
+
+
+def _lookup(table: Mapping[_Key, _T], descriptor: ProjectDescriptor, default: _T) -> _T:
+    """Resolve a (language, build_tool) entry, falling back to the (language, None) default."""
+    language = descriptor.language_lc
+    key = (language, descriptor.build_tool_lc)
+    if key in table:
+        return table[key]
+    return table.get((language, None), default)
+
+
+_GITLAB_TEMPLATES: Mapping[_Key, str] = MappingProxyType(
+    {
+        ("java", "maven"): "gitlab/java-maven.yml.j2",
+        ("kotlin", "maven"): "gitlab/java-maven.yml.j2",
+        ("java", None): "gitlab/java-gradle.yml.j2",
+        ("kotlin", None): "gitlab/java-gradle.yml.j2",
+        ("go", None): "gitlab/go.yml.j2",
+        ("js", None): "gitlab/node.yml.j2",
+        ("ts", None): "gitlab/node.yml.j2",
+        ("python", None): "gitlab/python.yml.j2",
+    }
+)
+
+_BASE_IMAGES: Mapping[_Key, str] = MappingProxyType(
+    {
+        ("java", "gradle"): "gradle:8-jdk17",
+        ("kotlin", "gradle"): "gradle:8-jdk17",
+        ("java", None): "maven:3.9-eclipse-temurin-17",
+        ("kotlin", None): "maven:3.9-eclipse-temurin-17",
+        ("go", None): "golang:1.22",
+        ("js", None): "node:20",
+        ("ts", None): "node:20",
+        ("python", None): "python:3.12",
+    }
+)
+
+# Cache paths compose: build-tool caches first, then language caches.
+_BUILD_TOOL_CACHES: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+    {
+        "maven": (".m2/repository",),
+        "gradle": (".gradle",),
+    }
+)
+_LANGUAGE_CACHES: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+    {
+        "js": ("node_modules", ".npm"),
+        "ts": ("node_modules", ".npm"),
+        "python": (".cache/pip",),
+        "go": ("go/pkg/mod",),
+    }
+)
+
+
+# Header comment of each built-in template; the rest of templates/gitlab/*.yml.j2 is shared.
+_GITLAB_HEADERS: Mapping[str, str] = MappingProxyType(
+    {
+        "gitlab/java-maven.yml.j2": "# GitLab CI template for Java (Maven)",
+        "gitlab/java-gradle.yml.j2": "# GitLab CI template for Java/Kotlin (Gradle)",
+        "gitlab/go.yml.j2": "# GitLab CI template for Go",
+        "gitlab/node.yml.j2": "# GitLab CI template for Node.js / TypeScript",
+        "gitlab/python.yml.j2": "# GitLab CI template for Python",
+        "gitlab/generic.yml.j2": "# Generic GitLab CI template",
+    }
+)
 
 
 def select_gitlab_template(descriptor: ProjectDescriptor) -> str:
     """Select the GitLab CI template path for a project."""
-    language = (descriptor.language or "").lower()
-    build_tool = (descriptor.build_tool or "").lower()
+    return _lookup(_GITLAB_TEMPLATES, descriptor, "gitlab/generic.yml.j2")
 
-    if language in {"java", "kotlin"}:
-        if build_tool == "maven":
-            return "gitlab/java-maven.yml.j2"
-        return "gitlab/java-gradle.yml.j2"
-    if language == "go":
-        return "gitlab/go.yml.j2"
-    if language in {"js", "ts"}:
-        return "gitlab/node.yml.j2"
-    if language == "python":
-        return "gitlab/python.yml.j2"
 
-    return "gitlab/generic.yml.j2"
+def _base_image(descriptor: ProjectDescriptor) -> str:
+    return _lookup(_BASE_IMAGES, descriptor, "alpine:3.19")
 
 
-def _base_image(descriptor: ProjectDescriptor) -> str:
-    language = (descriptor.language or "").lower()
-    build_tool = (descriptor.build_tool or "").lower()
-    if language in {"java", "kotlin"}:
-        if build_tool == "gradle":
-            return "gradle:8-jdk17"
-        return "maven:3.9-eclipse-temurin-17"
-    if language == "go":
-        return "golang:1.22"
-    if language in {"js", "ts"}:
-        return "node:20"
-    if language == "python":
-        return "python:3.12"
-    return "alpine:3.19"
-
-
-def _cache_paths(descriptor: ProjectDescriptor) -> List[str]:
-    language = (descriptor.language or "").lower()
-    build_tool = (descriptor.build_tool or "").lower()
-    caches: List[str] = []
-
-    if build_tool == "maven":
-        caches.append(".m2/repository")
-    if build_tool == "gradle":
-        caches.append(".gradle")
-    if language in {"js", "ts"}:
-        caches.append("node_modules")
-        caches.append(".npm")
-    if language == "python":
-        caches.append(".cache/pip")
-    if language == "go":
-        caches.append("go/pkg/mod")
-    return caches
-
-
-def _language_scripts(descriptor: ProjectDescriptor) -> Dict[str, List[str]]:
-    language = (descriptor.language or "").lower()
-    build_tool = (descriptor.build_tool or "").lower()
+def _cache_paths(descriptor: ProjectDescriptor) -> Tuple[str, ...]:
+    build_tool_caches = _BUILD_TOOL_CACHES.get(descriptor.build_tool_lc, ())
+    return build_tool_caches + _LANGUAGE_CACHES.get(descriptor.language_lc, ())
 
-    if language in {"java", "kotlin"}:
-        if build_tool == "gradle":
-            runner = "./gradlew"
-            return {
-                "prepare": [f"{runner} --no-daemon --version"],
-                "lint": [f"{runner} --no-daemon check"],
-                "test": [f"{runner} --no-daemon test"],
-                "sonar": [
-                    f"{runner} --no-daemon sonarqube "
-                    "-Dsonar.host.url=$SONAR_HOST_URL "
-                    "-Dsonar.login=$SONAR_TOKEN"
-                ],
-                "build": [f"{runner} --no-daemon build -x test"],
-                "package": [f"{runner} --no-daemon assemble -x test"],
-            }
-        runner = "mvn"
-        return {
-            "prepare": [f"{runner} -B dependency:go-offline"],
-            "lint": [f"{runner} -B -DskipTests verify"],
-            "test": [f"{runner} -B test"],
-            "sonar": [
-                f"{runner} -B sonar:sonar -Dsonar.host.url=$SONAR_HOST_URL -Dsonar.login=$SONAR_TOKEN"
-            ],
-            "build": [f"{runner} -B package -DskipTests"],
-            "package": [f"{runner} -B package -DskipTests"],
-        }
-
-    if language == "go":
-        return {
-            "prepare": ["go mod download"],
-            "lint": ["go vet ./..."],
-            "test": ["go test ./..."],
-            "sonar": ["echo \"Run SonarQube scanner for Go\""],
-            "build": ["go build -o app ./..."],
-            "package": ["tar -czf app.tar.gz app"],
-        }
-
-    if language in {"js", "ts"}:
-        pkg_manager = "npm"
-        return {
-            "prepare": [f"{pkg_manager} ci"],
-            "lint": [f"{pkg_manager} run lint"],
-            "test": [f"{pkg_manager} test -- --ci --runInBand"],
-            "sonar": ["echo \"Run SonarQube scanner for Node.js\""],
-            "build": [f"{pkg_manager} run build"],
-            "package": ["tar -czf app.tgz dist"],
-        }
-
-    if language == "python":
-        return {
-            "prepare": ["python -m pip install --upgrade pip", "pip install -r requirements.txt"],
-            "lint": ["flake8 . || true"],
-            "test": ["pytest"],
-            "sonar": ["echo \"Run SonarQube scanner for Python\""],
-            "build": ["python -m pip install build && python -m build || true"],
-            "package": ["ls dist || true"],
-        }
-
-    return {
-        "prepare": ["echo \"Prepare stage placeholder\""],
-        "lint": ["echo \"Lint stage placeholder\""],
-        "test": ["echo \"Test stage placeholder\""],
-        "sonar": ["echo \"Sonar stage placeholder\""],
-        "build": ["echo \"Build stage placeholder\""],
-        "package": ["echo \"Package stage placeholder\""],
+
+_Scripts = Mapping[str, Tuple[str, ...]]
+
+_GRADLE_SCRIPTS: _Scripts = MappingProxyType(
+    {
+        "prepare": ("./gradlew --no-daemon --version",),
+        "lint": ("./gradlew --no-daemon check",),
+        "test": ("./gradlew --no-daemon test",),
+        "sonar": (
+            "./gradlew --no-daemon sonarqube "
+            "-Dsonar.host.url=$SONAR_HOST_URL "
+            "-Dsonar.login=$SONAR_TOKEN",
+        ),
+        "build": ("./gradlew --no-daemon build -x test",),
+        "package": ("./gradlew --no-daemon assemble -x test",),
+    }
+)
+
+_MAVEN_SCRIPTS: _Scripts = MappingProxyType(
+    {
+        "prepare": ("mvn -B dependency:go-offline",),
+        "lint": ("mvn -B -DskipTests verify",),
+        "test": ("mvn -B test",),
+        "sonar": ("mvn -B sonar:sonar -Dsonar.host.url=$SONAR_HOST_URL -Dsonar.login=$SONAR_TOKEN",),
+        "build": ("mvn -B package -DskipTests",),
+        "package": ("mvn -B package -DskipTests",),
+    }
+)
+
+_GO_SCRIPTS: _Scripts = MappingProxyType(
+    {
+        "prepare": ("go mod download",),
+        "lint": ("go vet ./...",),
+        "test": ("go test ./...",),
+        "sonar": ("echo \"Run SonarQube scanner for Go\"",),
+        "build": ("go build -o app ./...",),
+        "package": ("tar -czf app.tar.gz app",),
+    }
+)
+
+_NODE_SCRIPTS: _Scripts = MappingProxyType(
+    {
+        "prepare": ("npm ci",),
+        "lint": ("npm run lint",),
+        "test": ("npm test -- --ci --runInBand",),
+        "sonar": ("echo \"Run SonarQube scanner for Node.js\"",),
+        "build": ("npm run build",),
+        "package": ("tar -czf app.tgz dist",),
+    }
+)
+
+_PYTHON_SCRIPTS: _Scripts = MappingProxyType(
+    {
+        "prepare": ("python -m pip install --upgrade pip", "pip install -r requirements.txt"),
+        "lint": ("flake8 . || true",),
+        "test": ("pytest",),
+        "sonar": ("echo \"Run SonarQube scanner for Python\"",),
+        "build": ("python -m pip install build && python -m build || true",),
+        "package": ("ls dist || true",),
+    }
+)
+
+_GENERIC_SCRIPTS: _Scripts = MappingProxyType(
+    {
+        "prepare": ("echo \"Prepare stage placeholder\"",),
+        "lint": ("echo \"Lint stage placeholder\"",),
+        "test": ("echo \"Test stage placeholder\"",),
+        "sonar": ("echo \"Sonar stage placeholder\"",),
+        "build": ("echo \"Build stage placeholder\"",),
+        "package": ("echo \"Package stage placeholder\"",),
+    }
+)
+
+_LANGUAGE_SCRIPTS: Mapping[_Key, _Scripts] = MappingProxyType(
+    {
+        ("java", "gradle"): _GRADLE_SCRIPTS,
+        ("kotlin", "gradle"): _GRADLE_SCRIPTS,
+        ("java", None): _MAVEN_SCRIPTS,
+        ("kotlin", None): _MAVEN_SCRIPTS,
+        ("go", None): _GO_SCRIPTS,
+        ("js", None): _NODE_SCRIPTS,
+        ("ts", None): _NODE_SCRIPTS,
+        ("python", None): _PYTHON_SCRIPTS,
     }
+)
+
+
+def _language_scripts(descriptor: ProjectDescriptor) -> _Scripts:
+    return _lookup(_LANGUAGE_SCRIPTS, descriptor, _GENERIC_SCRIPTS)
 
 
 def _deploy_rules(target: str) -> List[Dict[str, Any]]:
@@ -166,23 +244,138 @@ def _deploy_rules(target: str) -> List[Dict[str, Any]]:
     return [{"if": '$CI_COMMIT_BRANCH == "main"'}, {"if": "$CI_COMMIT_TAG"}]
 
 
-def generate_gitlab_ci(descriptor: ProjectDescriptor, ci_context: Dict[str, Any]) -> PipelineRenderResult:
-    """Return the contents of a .gitlab-ci.yml suited for the project."""
+# Docker and deploy jobs do not reuse the dependency cache.
+_UNCACHED_STAGES = frozenset({"docker_build", "push", "deploy_staging", "deploy_prod"})
+
+# (job name, stage, needs) in emission order; integration_test is dropped when no such tests exist.
+_JOB_TABLE: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("prepare", "prepare", ()),
+    ("lint", "lint", ("prepare",)),
+    ("test", "test", ("lint",)),
+    ("integration_test", "test", ("lint",)),
+    ("sonar", "sonar", ("test",)),
+    ("build", "build", ("test",)),
+    ("package", "package", ("build",)),
+    ("docker_build", "docker_build", ("package",)),
+    ("push", "push", ("docker_build",)),
+    ("deploy_staging", "deploy_staging", ("push",)),
+    ("deploy_prod", "deploy_prod", ("push",)),
+)
+
+_DOCKER_LOGIN = "echo $CI_JOB_TOKEN | docker login -u $CI_REGISTRY_USER --password-stdin $CI_REGISTRY"
+_DOCKER_JOB: Mapping[str, Any] = MappingProxyType(
+    {
+        "image": "docker:24",
+        "services": ("docker:24-dind",),
+        "variables": MappingProxyType({"DOCKER_TLS_CERTDIR": ""}),
+    }
+)
+
+
+def _make_job(
+    stage: str,
+    script: Sequence[str],
+    caches: Sequence[str],
+    *,
+    needs: Sequence[str] = (),
+    artifacts: Sequence[str] = (),
+    variables: Optional[Mapping[str, str]] = None,
+    image: Optional[str] = None,
+    rules: Sequence[Mapping[str, Any]] = (),
+    services: Sequence[str] = (),
+) -> Job:
+    return Job(
+        stage=stage,
+        script=script,
+        needs=needs,
+        artifacts=artifacts,
+        variables=variables or {},
+        image=image,
+        rules=rules,
+        services=services,
+        cache_paths=() if stage in _UNCACHED_STAGES else caches,
+    )
+
+
+def _emit_gitlab_yaml(
+    header: str,
+    stages: Sequence[str],
+    ci: Dict[str, Any],
+    job_defaults: Dict[str, Any],
+    jobs: Dict[str, Job],
+) -> List[str]:
+    """Emit the built-in GitLab CI layout as text chunks, matching templates/gitlab/*.yml.j2 byte for byte."""
+    parts: List[str] = [header, "\nstages:\n"]
+    parts.extend(f"\n  - {stage}\n" for stage in stages)
+    parts.append(
+        "\n\nvariables:\n"
+        '  DOCKER_TLS_CERTDIR: ""\n'
+        f"  SONAR_HOST_URL: \"{ci['sonar_host']}\"\n"
+        f"  SONAR_TOKEN: \"{ci['sonar_token']}\"\n"
+        f"  DOCKER_IMAGE: \"{ci['docker_image']}\"\n"
+        f"  DOCKER_TAG: \"{ci['docker_tag']}\"\n"
+        f"  DOCKER_IMAGE_FULL: \"{ci['docker_image_full']}\"\n"
+        "\ndefault:\n"
+        f"  image: {job_defaults['image']}\n"
+        "  interruptible: true\n"
+    )
+    if job_defaults["before_script"]:
+        parts.append("  before_script:\n")
+        parts.extend(f"    - {line}\n" for line in job_defaults["before_script"])
+    parts.append("\n\n")
+
+    for name, job in jobs.items():
+        parts.append(f"\n{name}:\n  stage: {job.stage}\n")
+        if job.image:
+            parts.append(f"  image: {job.image}\n")
+        if job.services:
+            parts.append("  services:\n")
+            parts.extend(f"    - {service}\n" for service in job.services)
+        if job.needs:
+            parts.append("  needs:\n")
+            parts.extend(f"    - {need}\n" for need in job.needs)
+        if job.variables:
+            parts.append("  variables:\n")
+            parts.extend(f'    {key}: "{value}"\n' for key, value in job.variables.items())
+        if job.cache_paths:
+            parts.append('  cache:\n    key: "${CI_COMMIT_REF_SLUG}"\n    paths:\n')
+            parts.extend(f"      - {path}\n" for path in job.cache_paths)
+        parts.append("  script:\n")
+        parts.extend(f"    - {line}\n" for line in job.script)
+        if job.artifacts:
+            parts.append("  artifacts:\n    paths:\n")
+            parts.extend(f"      - {artifact}\n" for artifact in job.artifacts)
+        if job.rules:
+            parts.append("  rules:\n")
+            parts.extend(f"    - if: {rule['if']}\n" for rule in job.rules)
+        parts.append("\n\n")
+
+    parts.append("\n")
+    return parts
+
+
+def _builtin_chunks(template_path: str, context: Dict[str, Any]) -> List[str]:
+    return _emit_gitlab_yaml(
+        _GITLAB_HEADERS[template_path],
+        context["stages"],
+        context["ci"],
+        context["job_defaults"],
+        context["jobs"],
+    )
+
+
+def _pipeline_context(
+    descriptor: ProjectDescriptor, ci_context: Dict[str, Any]
+) -> Tuple[str, Dict[str, Any]]:
+    """Select the template and build the render context shared by both output modes."""
     template_path = select_gitlab_template(descriptor)
     scripts = _language_scripts(descriptor)
     caches = _cache_paths(descriptor)
 
-    docker_image = ci_context.get("docker_image", "$CI_REGISTRY_IMAGE")
-    docker_tag = ci_context.get("docker_tag", "${CI_COMMIT_SHORT_SHA:-latest}")
-    docker_image_full = f"{docker_image}:{docker_tag}"
-    ci = {
-        "sonar_host": ci_context.get("sonar_host", "http://sonarqube:9000"),
-        "sonar_token": ci_context.get("sonar_token", "$SONAR_TOKEN"),
-        "docker_image": docker_image,
-        "docker_tag": docker_tag,
-        "docker_image_full": docker_image_full,
-        "registry": ci_context.get("registry", "$CI_REGISTRY"),
-    }
+    overrides = {key: ci_context[key] for key in _CI_DEFAULTS.keys() & ci_context.keys()}
+    ci: Dict[str, Any] = {**_CI_DEFAULTS, **overrides}
+    docker_image_full = f"{ci['docker_image']}:{ci['docker_tag']}"
+    ci["docker_image_full"] = docker_image_full
 
     base_image = ci_context.get("base_image") or _base_image(descriptor)
     job_defaults: Dict[str, Any] = {
@@ -191,108 +384,54 @@ def generate_gitlab_ci(descriptor: ProjectDescriptor, ci_context: Dict[str, Any]
         "before_script": ci_context.get("before_script", []),
     }
 
-    jobs: Dict[str, Dict[str, Any]] = {}
-
     # Artifacts per language/build tool
-    package_artifacts: List[str] = []
-    build_artifacts: List[str] = []
-    language = (descriptor.language or "").lower()
-    build_tool = (descriptor.build_tool or "").lower()
+    package_artifacts: Tuple[str, ...] = ()
+    build_artifacts: Tuple[str, ...] = ()
+    language = descriptor.language_lc
+    build_tool = descriptor.build_tool_lc
     if language in {"java", "kotlin"}:
-        package_artifacts = ["target/*.jar"] if build_tool == "maven" else ["build/libs/*.jar"]
+        package_artifacts = ("target/*.jar",) if build_tool == "maven" else ("build/libs/*.jar",)
         build_artifacts = package_artifacts
     elif language == "go":
-        package_artifacts = ["app", "app.tar.gz"]
-        build_artifacts = ["app"]
+        package_artifacts = ("app", "app.tar.gz")
+        build_artifacts = ("app",)
     elif language in {"js", "ts"}:
-        package_artifacts = ["app.tgz", "dist/"]
-        build_artifacts = ["dist/"]
+        package_artifacts = ("app.tgz", "dist/")
+        build_artifacts = ("dist/",)
     elif language == "python":
-        package_artifacts = ["dist/"]
-        build_artifacts = ["dist/"]
-
-    def add_job(
-        name: str,
-        stage: str,
-        script: List[str],
-        needs: Optional[List[str]] = None,
-        artifacts: Optional[List[str]] = None,
-        variables: Optional[Dict[str, str]] = None,
-        image: Optional[str] = None,
-        rules: Optional[List[Dict[str, Any]]] = None,
-        services: Optional[List[str]] = None,
-    ) -> None:
-        jobs[name] = {
-            "stage": stage,
-            "script": script,
-            "needs": needs or [],
-            "artifacts": artifacts or [],
-            "variables": variables or {},
-            "image": image,
-            "rules": rules or [],
-            "services": services or [],
-            "cache_paths": caches
-            if stage not in {"docker_build", "push", "deploy_staging", "deploy_prod"}
-            else [],
-        }
+        package_artifacts = ("dist/",)
+        build_artifacts = ("dist/",)
 
     detected_dirs = descriptor.additional_metadata.get("detected_dirs", {}) if descriptor.additional_metadata else {}
-    has_integration = any("integration" in name or "e2e" in name for name in detected_dirs.keys())
-
-    add_job("prepare", "prepare", scripts["prepare"])
-    add_job("lint", "lint", scripts["lint"], needs=["prepare"])
-    add_job("test", "test", scripts["test"], needs=["lint"])
-    if has_integration:
-        add_job("integration_test", "test", ["echo Running integration tests..."], needs=["lint"])
-    add_job(
-        "sonar",
-        "sonar",
-        scripts["sonar"],
-        needs=["test"],
-        variables={"SONAR_HOST_URL": ci["sonar_host"], "SONAR_TOKEN": ci["sonar_token"]},
-    )
-    add_job("build", "build", scripts["build"], needs=["test"], artifacts=build_artifacts)
-    add_job("package", "package", scripts["package"], needs=["build"], artifacts=package_artifacts)
-    add_job(
-        "docker_build",
-        "docker_build",
-        [
-            "echo $CI_JOB_TOKEN | docker login -u $CI_REGISTRY_USER --password-stdin $CI_REGISTRY",
+    # detected_dirs is keyed by lower-cased directory names.
+    has_integration = any(map(_INTEGRATION_DIR_RE.search, detected_dirs))
+
+    job_scripts: Dict[str, Sequence[str]] = {
+        **scripts,
+        "integration_test": ("echo Running integration tests...",),
+        "docker_build": (
+            _DOCKER_LOGIN,
             f"docker build -t {docker_image_full} .",
             f"docker save {docker_image_full} -o image.tar",
-        ],
-        needs=["package"],
-        image="docker:24",
-        services=["docker:24-dind"],
-        variables={"DOCKER_TLS_CERTDIR": ""},
-        artifacts=["image.tar"],
-    )
-    add_job(
-        "push",
-        "push",
-        [
-            "echo $CI_JOB_TOKEN | docker login -u $CI_REGISTRY_USER --password-stdin $CI_REGISTRY",
-            f"docker push {docker_image_full}",
-        ],
-        needs=["docker_build"],
-        image="docker:24",
-        services=["docker:24-dind"],
-        variables={"DOCKER_TLS_CERTDIR": ""},
-    )
-    add_job(
-        "deploy_staging",
-        "deploy_staging",
-        ["echo Deploying to staging..."],
-        needs=["push"],
-        rules=_deploy_rules("staging"),
-    )
-    add_job(
-        "deploy_prod",
-        "deploy_prod",
-        ["echo Deploying to production..."],
-        needs=["push"],
-        rules=_deploy_rules("prod"),
-    )
+        ),
+        "push": (_DOCKER_LOGIN, f"docker push {docker_image_full}"),
+        "deploy_staging": ("echo Deploying to staging...",),
+        "deploy_prod": ("echo Deploying to production...",),
+    }
+    job_options: Dict[str, Mapping[str, Any]] = {
+        "sonar": {"variables": {"SONAR_HOST_URL": ci["sonar_host"], "SONAR_TOKEN": ci["sonar_token"]}},
+        "build": {"artifacts": build_artifacts},
+        "package": {"artifacts": package_artifacts},
+        "docker_build": {**_DOCKER_JOB, "artifacts": ("image.tar",)},
+        "push": _DOCKER_JOB,
+        "deploy_staging": {"rules": _deploy_rules("staging")},
+        "deploy_prod": {"rules": _deploy_rules("prod")},
+    }
+    jobs: Dict[str, Job] = {
+        name: _make_job(stage, job_scripts[name], caches, needs=needs, **job_options.get(name, {}))
+        for name, stage, needs in _JOB_TABLE
+        if has_integration or name != "integration_test"
+    }
 
     context = {
         "descriptor": descriptor,
@@ -302,31 +441,60 @@ def generate_gitlab_ci(descriptor: ProjectDescriptor, ci_context: Dict[str, Any]
         "job_defaults": job_defaults,
     }
 
-    try:
-        content = render_template(template_path, context)
+    return template_path, context
+
+
+def generate_gitlab_ci(descriptor: ProjectDescriptor, ci_context: Dict[str, Any]) -> PipelineRenderResult:
+    """Return the contents of a .gitlab-ci.yml suited for the project."""
+    template_path, context = _pipeline_context(descriptor, ci_context)
+    if not templates_overridden():
+        # Built-in layout: skip Jinja entirely.
+        content = "".join(_builtin_chunks(template_path, context))
         used_template = template_path
-    except (TemplateNotFound, FileNotFoundError):
-        # Fallback generic template content
-        used_template = "generated-inline"
-        content_lines = ["stages:"] + [f"  - {stage}" for stage in STAGES]
-        content_lines += [
-            "variables:",
-            f"  SONAR_HOST_URL: \"{ci['sonar_host']}\"",
-            f"  SONAR_TOKEN: \"{ci['sonar_token']}\"",
-            f"  DOCKER_IMAGE: \"{ci['docker_image']}\"",
-            f"  DOCKER_TAG: \"{ci['docker_tag']}\"",
-            f"  DOCKER_IMAGE_FULL: \"{ci['docker_image_full']}\"",
-        ]
-        for name, job in jobs.items():
-            content_lines.append(f"\n{name}:")
-            content_lines.append(f"  stage: {job['stage']}")
-            if job["needs"]:
-                content_lines.append("  needs:")
-                for need in job["needs"]:
-                    content_lines.append(f"    - {need}")
-            content_lines.append("  script:")
-            for line in job["script"]:
-                content_lines.append(f"    - {line}")
-        content = "\n".join(content_lines)
+    else:
+        try:
+            content = render_template(template_path, context)
+            used_template = template_path
+        except FileNotFoundError:
+            # Custom templates directory lacks this template; emit the built-in layout.
+            content = "".join(_builtin_chunks(template_path, context))
+            used_template = "generated-inline"
 
     return PipelineRenderResult(content=content, template_used=used_template, context=context)
+
+
+def generate_gitlab_ci_to_file(descriptor: ProjectDescriptor, ci_context: Dict[str, Any], path: Path) -> str:
+    """Write the project's .gitlab-ci.yml straight to ``path`` and return the template used.
+
+    Equivalent to ``generate_gitlab_ci`` but never holds the pipeline as a single string.
+    Output is streamed into a temporary file next to ``path`` and only moved into place
+    once rendering succeeds, so a failing template leaves an existing file untouched.
+    """
+    template_path, context = _pipeline_context(descriptor, ci_context)
+    used_template = template_path
+    tmp_name = path.with_name(f".{path.name}.{uuid.uuid4().hex[:12]}.tmp")
+    # Created like a regular open(): the umask decides the final file's permissions.
+    fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        # newline="" keeps "\n" line endings, like the other artifacts written as bytes.
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            rendered = False
+            if templates_overridden():
+                try:
+                    stream_template(template_path, context, handle)
+                    rendered = True
+                except FileNotFoundError:
+                    # Drop anything rendered before a missing include was hit.
+                    handle.seek(0)
+                    handle.truncate()
+                    used_template = "generated-inline"
+            if not rendered:
+                handle.writelines(_builtin_chunks(template_path, context))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return used_template
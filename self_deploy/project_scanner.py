@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 @dataclass
@@ -20,49 +20,113 @@ class ProjectDescriptor:
     root_path: str = ""
     additional_metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # Lower-cased on read rather than at construction: descriptors are mutated after
+    # construction, and each generator reads these once per call.
+    @property
+    def language_lc(self) -> str:
+        """Lower-cased language, or an empty string when unknown."""
+        return (self.language or "").lower()
+
+    @property
+    def build_tool_lc(self) -> str:
+        """Lower-cased build tool, or an empty string when unknown."""
+        return (self.build_tool or "").lower()
+
+TARGET_FILES = frozenset(
+    {
+        "pom.xml",
+        "build.gradle",
+        "build.gradle.kts",
+        "go.mod",
+        "package.json",
+        "tsconfig.json",
+        "pyproject.toml",
+        "requirements.txt",
+        "pipfile",
+        "dockerfile",
+        "docker-compose.yml",
+    }
+)
+
+YAML_SUFFIXES = (".yml", ".yaml")
+
+K8S_INDICATORS = (
+    "k8s",
+    "kubernetes",
+    "deployment",
+    "service",
+    "ingress",
+    "statefulset",
+    "daemonset",
+    "pod",
+    "cronjob",
+)
+
+SOURCE_DIR_NAMES = frozenset({"src", "tests", "test", "cmd", "internal", "apps"})
+SOURCE_DIR_PREFIXES = ("src", "test")
+
+
+# Vendored, generated or VCS trees that never hold project descriptors worth scanning.
+IGNORED_DIRS = frozenset(
+    {".git", "node_modules", "vendor", "target", "build", "dist", ".venv", "venv", "__pycache__"}
+)
+MAX_SCAN_DEPTH = 6
+_READ_WORKERS = 8
+
+
+def _iter_entries(root_abs: str) -> Iterator[Tuple[os.DirEntry, bool]]:
+    """Yield ``(entry, is_dir)`` top-down like os.walk, pruning IGNORED_DIRS and deep trees.
+
+    Directory symlinks are reported but not descended into, matching os.walk's default.
+    """
+    stack: List[Tuple[str, int]] = [(root_abs, 0)]
+    while stack:
+        current, depth = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs: List[str] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            yield entry, is_dir
+            if (
+                is_dir
+                and depth + 1 < MAX_SCAN_DEPTH
+                and entry.name not in IGNORED_DIRS
+                and not entry.is_symlink()
+            ):
+                subdirs.append(entry.path)
+        stack.extend((path, depth + 1) for path in reversed(subdirs))
+
+
+def _looks_like_k8s_manifest(path: str, filename_lower: str, content: Optional[str] = None) -> bool:
+    """Heuristic to identify Kubernetes manifest files.
 
-TARGET_FILES = {
-    "pom.xml",
-    "build.gradle",
-    "build.gradle.kts",
-    "go.mod",
-    "package.json",
-    "tsconfig.json",
-    "pyproject.toml",
-    "requirements.txt",
-    "pipfile",
-    "dockerfile",
-    "docker-compose.yml",
-}
-
-
-def _looks_like_k8s_manifest(path: str, filename: str) -> bool:
-    """Heuristic to identify Kubernetes manifest files."""
-    lower = filename.lower()
-    if not lower.endswith((".yml", ".yaml")):
+    Expects an already lower-cased ``filename_lower``; ``content`` can carry text the
+    scanner already loaded, avoiding a second read of the file.
+    """
+    if not filename_lower.endswith(YAML_SUFFIXES):
         return False
 
-    k8s_indicators = (
-        "k8s",
-        "kubernetes",
-        "deployment",
-        "service",
-        "ingress",
-        "statefulset",
-        "daemonset",
-        "pod",
-        "cronjob",
-    )
-    if any(indicator in lower for indicator in k8s_indicators):
+    if any(indicator in filename_lower for indicator in K8S_INDICATORS):
         return True
 
+    if content is not None:
+        head_text = content[:2048]
+        return "apiVersion" in head_text and "kind" in head_text
+
     try:
-        with open(path, "r", encoding="utf-8") as handle:
+        with open(path, "rb") as handle:
             head = handle.read(2048)
     except OSError:
         return False
 
-    return "apiVersion" in head and "kind" in head
+    return b"apiVersion" in head and b"kind" in head
 
 
 def _load_file_content(path: str) -> Optional[str]:
@@ -95,45 +159,61 @@ def scan_project(root_path: str) -> ProjectDescriptor:
         additional_metadata=metadata,
     )
 
-    for current_root, dirs, files in os.walk(root_abs):
-        rel_dir = os.path.relpath(current_root, root_abs)
-        if rel_dir == ".":
-            rel_dir = ""
-        for d in dirs:
-            d_lower = d.lower()
-            if d_lower in {"src", "tests", "test", "cmd", "internal", "apps"} or d_lower.startswith(
-                ("src", "test")
-            ):
-                metadata["detected_dirs"].setdefault(d_lower, []).append(os.path.join(rel_dir, d))
-
-        for filename in files:
-            filename_lower = filename.lower()
-            filepath = os.path.join(current_root, filename)
-            relpath = os.path.relpath(filepath, root_abs)
-
-            if filename_lower.endswith(".go"):
-                metadata["go_packages"].append(relpath)
-            if filename_lower.endswith(".py"):
-                metadata["python_packages"].append(relpath)
-            if filename_lower.endswith((".js", ".ts", ".tsx", ".jsx")):
-                metadata["node_packages"].append(relpath)
-
-            # Track targeted files
-            if filename_lower in TARGET_FILES:
-                metadata["detected_files"].setdefault(filename_lower, []).append(relpath)
-
-                if filename_lower == "dockerfile":
-                    descriptor.dockerfile_present = True
-                    metadata["dockerfiles"].append(relpath)
-                if filename_lower == "docker-compose.yml":
-                    metadata["docker_compose_files"].append(relpath)
-
-                content = _load_file_content(filepath)
-                if content is not None:
-                    metadata["file_contents"].setdefault(filename_lower, []).append(content)
-
-            # Kubernetes heuristics
-            if _looks_like_k8s_manifest(filepath, filename):
+    # Walk first, then read the collected files in bulk.
+    target_files: List[Tuple[str, str]] = []
+    yaml_files: List[Tuple[str, str, str]] = []
+    prefix_len = len(os.path.join(root_abs, ""))
+    for entry, is_dir in _iter_entries(root_abs):
+        relpath = entry.path[prefix_len:]
+        if is_dir:
+            d_lower = entry.name.lower()
+            if d_lower in SOURCE_DIR_NAMES or d_lower.startswith(SOURCE_DIR_PREFIXES):
+                metadata["detected_dirs"].setdefault(d_lower, []).append(relpath)
+            continue
+
+        filename_lower = entry.name.lower()
+        filepath = entry.path
+        if filename_lower.endswith(".go"):
+            metadata["go_packages"].append(relpath)
+        if filename_lower.endswith(".py"):
+            metadata["python_packages"].append(relpath)
+        if filename_lower.endswith((".js", ".ts", ".tsx", ".jsx")):
+            metadata["node_packages"].append(relpath)
+
+        # Track targeted files
+        if filename_lower in TARGET_FILES:
+            metadata["detected_files"].setdefault(filename_lower, []).append(relpath)
+
+            if filename_lower == "dockerfile":
+                descriptor.dockerfile_present = True
+                metadata["dockerfiles"].append(relpath)
+            if filename_lower == "docker-compose.yml":
+                metadata["docker_compose_files"].append(relpath)
+
+            target_files.append((filename_lower, filepath))
+
+        if filename_lower.endswith(YAML_SUFFIXES):
+            yaml_files.append((relpath, filename_lower, filepath))
+
+    from concurrent.futures import ThreadPoolExecutor  # deferred: keeps CLI start-up cheap
+
+    # Reading is I/O bound and releases the GIL, so reads overlap in a thread pool;
+    # map() keeps results in walk order.
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+        loaded: Dict[str, str] = {}
+        contents = pool.map(_load_file_content, [filepath for _, filepath in target_files])
+        for (filename_lower, filepath), content in zip(target_files, contents):
+            if content is not None:
+                metadata["file_contents"].setdefault(filename_lower, []).append(content)
+                loaded[filepath] = content
+
+        # Kubernetes heuristics
+        manifest_flags = pool.map(
+            lambda item: _looks_like_k8s_manifest(item[2], item[1], loaded.get(item[2])),
+            yaml_files,
+        )
+        for (relpath, _, _), is_manifest in zip(yaml_files, manifest_flags):
+            if is_manifest:
                 descriptor.has_k8s_manifests = True
                 metadata["k8s_manifests"].append(relpath)
 
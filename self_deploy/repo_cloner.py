@@ -11,33 +11,76 @@ from typing import Optional
 def clone_repo(repo_url: str, branch: Optional[str] = None) -> str:
     """Clone the given git repo into a temporary directory and return the local path.
 
-    A temporary workspace directory is created and the repository is cloned into it.
-    If a branch or tag is provided, that ref is checked out. A RuntimeError is raised
-    on any git failure with stderr included for easier debugging.
+    A temporary workspace directory is created and a shallow, single-branch clone of
+    the repository is made into it; only the working tree at one ref is needed for
+    analysis. If a branch or tag is provided, the clone is made at that ref. A
+    RuntimeError is raised on any git failure with stderr included for easier debugging.
     """
     workspace = tempfile.mkdtemp(prefix="self-deploy-")
     target_path = os.path.join(workspace, "repo")
 
-    clone_cmd = ["git", "clone"]
+    clone_cmd = ["git", "clone", "--depth", "1", "--single-branch", "--no-tags"]
     if branch:
-        clone_cmd.extend(["--branch", branch, "--single-branch"])
+        clone_cmd.extend(["--branch", branch])
     clone_cmd.extend([repo_url, target_path])
 
     try:
-        subprocess.run(clone_cmd, check=True, capture_output=True, text=True)
-        if branch:
-            subprocess.run(
-                ["git", "-C", target_path, "checkout", branch],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+        # Progress output is discarded; stderr is kept as bytes and only decoded on failure.
+        subprocess.run(clone_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
     except FileNotFoundError as exc:
         raise RuntimeError("Git is not installed or not available in PATH.") from exc
     except subprocess.CalledProcessError as exc:
+        stderr = exc.stderr.decode("utf-8", "replace") if exc.stderr else ""
         raise RuntimeError(
             f"Failed to clone repository '{repo_url}'"
-            f"{' at ' + branch if branch else ''}: {exc.stderr or exc}"
+            f"{' at ' + branch if branch else ''}: {stderr or exc}"
         ) from exc
 
     return target_path
+
+
+def resolve_remote_head(repo_url: str, branch: Optional[str] = None) -> Optional[str]:
+    """Return the commit SHA the remote ref points to, or None if it cannot be resolved.
+
+    Uses ``git ls-remote`` so no objects are transferred. ls-remote matches patterns
+    against the tail of ref names, so only exact ref names are accepted, in the order
+    ``git clone --branch`` resolves them: branch, then tag (peeled to its commit).
+    Refs that are not advertised by the remote (e.g. raw commit SHAs) resolve to None.
+    """
+    if branch:
+        candidates = [f"refs/heads/{branch}", f"refs/tags/{branch}^{{}}", f"refs/tags/{branch}"]
+    else:
+        candidates = ["HEAD"]
+    try:
+        completed = subprocess.run(
+            ["git", "ls-remote", repo_url, *candidates],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+
+    refs = {}
+    for line in completed.stdout.splitlines():
+        sha, _, ref = line.partition("\t")
+        if sha and ref:
+            refs[ref.strip()] = sha.strip()
+    for ref in candidates:
+        if ref in refs:
+            return refs[ref]
+    return None
+
+
+def resolve_local_head(repo_path: str) -> Optional[str]:
+    """Return the commit SHA checked out in a local clone, or None if git cannot tell."""
+    try:
+        completed = subprocess.run(
+            ["git", "-C", repo_path, "rev-parse", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
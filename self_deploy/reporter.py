@@ -2,21 +2,41 @@
 
 from __future__ import annotations
 
+import io
 import json
-from dataclasses import asdict
+from dataclasses import fields
 from pathlib import Path
 from typing import Any, Dict, List
 
 from .project_scanner import ProjectDescriptor
 
+try:  # optional C-accelerated encoder, see the "fast" extra
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 
 def _write_file(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    path.write_bytes(content.encode("utf-8"))
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2)
 
 
-def _descriptor_dict(descriptor: ProjectDescriptor) -> Dict[str, Any]:
-    return asdict(descriptor)
+def _descriptor_dict(descriptor: ProjectDescriptor, include_contents: bool = False) -> Dict[str, Any]:
+    # Shallow field view: unlike asdict() this does not deep-copy additional_metadata.
+    data = {f.name: getattr(descriptor, f.name) for f in fields(descriptor)}
+    if not include_contents:
+        # Raw manifest contents dwarf the actual analysis, so they are left out by default.
+        data["additional_metadata"] = {
+            key: value for key, value in descriptor.additional_metadata.items() if key != "file_contents"
+        }
+    return data
 
 
 def generate_reports(
@@ -26,12 +46,17 @@ def generate_reports(
     dockerfile_template: str | None,
     generated_files: List[str],
     warnings: List[str],
+    include_contents: bool = False,
 ) -> None:
-    """Write JSON and Markdown reports to the output directory."""
+    """Write JSON and Markdown reports to the output directory.
+
+    Scanned file contents are omitted from report.json unless ``include_contents`` is set.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
     report_json_path = output_dir / "report.json"
     report_md_path = output_dir / "report.md"
 
-    descriptor_dict = _descriptor_dict(descriptor)
+    descriptor_dict = _descriptor_dict(descriptor, include_contents)
     report_data = {
         "descriptor": descriptor_dict,
         "ci_template": ci_template,
@@ -40,32 +65,27 @@ def generate_reports(
         "warnings": warnings,
     }
 
-    _write_file(report_json_path, json.dumps(report_data, indent=2))
-
-    md_lines = [
-        "# Self Deploy Report",
-        "",
-        "## Detected Stack",
-        f"- Language: {descriptor.language or 'unknown'}",
-        f"- Framework: {descriptor.framework or 'unknown'}",
-        f"- Build tool: {descriptor.build_tool or 'unknown'}",
-        f"- Package manager: {descriptor.package_manager or 'unknown'}",
-        f"- Tests: {', '.join(descriptor.tests) if descriptor.tests else 'none detected'}",
-        f"- Dockerfile present: {'yes' if descriptor.dockerfile_present else 'no'}",
-        f"- Kubernetes manifests: {'yes' if descriptor.has_k8s_manifests else 'no'}",
-        "",
-        "## Templates",
-        f"- CI template: {ci_template}",
-        f"- Dockerfile template: {dockerfile_template or 'skipped (existing)'}",
-        "",
-        "## Generated Files",
-    ]
-    md_lines.extend(f"- {path}" for path in generated_files)
-    md_lines.append("")
-    md_lines.append("## Warnings")
-    if warnings:
-        md_lines.extend(f"- {w}" for w in warnings)
-    else:
-        md_lines.append("- None")
-
-    _write_file(report_md_path, "\n".join(md_lines))
+    _write_json(report_json_path, report_data)
+
+    buf = io.StringIO()
+    w = buf.write
+    w("# Self Deploy Report\n\n## Detected Stack\n")
+    w(f"- Language: {descriptor.language or 'unknown'}\n")
+    w(f"- Framework: {descriptor.framework or 'unknown'}\n")
+    w(f"- Build tool: {descriptor.build_tool or 'unknown'}\n")
+    w(f"- Package manager: {descriptor.package_manager or 'unknown'}\n")
+    w(f"- Tests: {', '.join(descriptor.tests) if descriptor.tests else 'none detected'}\n")
+    w(f"- Dockerfile present: {'yes' if descriptor.dockerfile_present else 'no'}\n")
+    w(f"- Kubernetes manifests: {'yes' if descriptor.has_k8s_manifests else 'no'}\n")
+    w("\n## Templates\n")
+    w(f"- CI template: {ci_template}\n")
+    w(f"- Dockerfile template: {dockerfile_template or 'skipped (existing)'}\n")
+    w("\n## Generated Files\n")
+    for path in generated_files:
+        w(f"- {path}\n")
+    # The report has no trailing newline, so warning lines are prefixed rather than terminated.
+    w("\n## Warnings")
+    for warning in warnings or ("None",):
+        w(f"\n- {warning}")
+
+    _write_file(report_md_path, buf.getvalue())
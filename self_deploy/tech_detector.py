@@ -4,29 +4,100 @@ from __future__ import annotations
 
 import json
 import re
-from copy import deepcopy
 from dataclasses import replace
-from typing import Iterable, Set
+from typing import Any, Dict, Iterable, Iterator, Set, Tuple
 
 from .project_scanner import ProjectDescriptor
 
 
-def _contains_any(contents: Iterable[str], keywords: Iterable[str]) -> bool:
+# (name, keywords) rules in priority order: the first matching framework rule wins, every
+# matching test rule is reported.
+_KeywordRules = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+_JAVA_FRAMEWORKS: _KeywordRules = (
+    ("spring", ("spring-boot", "springframework", "spring.core", "spring.context")),
+    ("micronaut", ("micronaut",)),
+    ("quarkus", ("quarkus",)),
+)
+_JAVA_TESTS: _KeywordRules = (
+    ("junit", ("junit",)),
+    ("testng", ("testng",)),
+    ("kotest", ("kotest",)),
+)
+_GO_FRAMEWORKS: _KeywordRules = (
+    ("gin", ("github.com/gin-gonic/gin", "github.com/gin-gonic")),
+    ("echo", ("github.com/labstack/echo", "github.com/labstack/echo/v4")),
+    ("fiber", ("github.com/gofiber/fiber",)),
+    ("chi", ("github.com/go-chi/chi",)),
+)
+_GO_TESTS: _KeywordRules = (
+    ("testify", ("github.com/stretchr/testify", "testify")),
+    ("ginkgo", ("github.com/onsi/ginkgo", "ginkgo")),
+)
+_NODE_FRAMEWORKS: _KeywordRules = tuple(
+    (name, (name,)) for name in ("nestjs", "next", "express", "fastify", "koa", "react", "vue", "svelte")
+)
+_NODE_TESTS: _KeywordRules = tuple(
+    (name, (name,)) for name in ("jest", "mocha", "vitest", "ava", "tap", "cypress")
+)
+_PYTHON_FRAMEWORKS: _KeywordRules = (
+    ("django", ("django",)),
+    ("fastapi", ("fastapi",)),
+    ("flask", ("flask",)),
+    ("starlette", ("starlette",)),
+)
+_PYTHON_TESTS: _KeywordRules = (
+    ("pytest", ("pytest",)),
+    ("unittest", ("unittest", "unittest2")),
+    ("nose", ("nose", "nose2")),
+    ("tox", ("tox",)),
+)
+
+_GO_VERSION_RE = re.compile(r"\bgo\s+([0-9.]+)", re.IGNORECASE)
+_PYTHON_VERSION_RE = re.compile(r"python[^\n]*([0-9]+\.[0-9]+)", re.IGNORECASE)
+
+
+def _lowered_text(contents: Iterable[str]) -> str:
+    """Join blobs into one lower-cased text so keyword checks do not re-lower each blob."""
+    return "\n".join(contents).lower()
+
+
+def _has_any(text: str, keywords: Iterable[str]) -> bool:
+    return any(keyword in text for keyword in keywords)
+
+
+def _matching_rules(rules: _KeywordRules, *texts: str) -> Iterator[str]:
+    """Yield the names of ``rules`` with a keyword in any of ``texts``, in table order."""
+    for name, keywords in rules:
+        if any(_has_any(text, keywords) for text in texts):
+            yield name
+
+
+def _search_blobs(pattern: re.Pattern[str], contents: Iterable[str]) -> str | None:
+    """Return the first group of the first blob matching ``pattern``; blobs are searched one by one."""
     for content in contents:
-        lower = content.lower()
-        if any(keyword in lower for keyword in keywords):
-            return True
-    return False
+        match = pattern.search(content)
+        if match:
+            return match.group(1)
+    return None
 
 
-def _collect_package_dependencies(package_json_blobs: list[str]) -> Set[str]:
-    deps: Set[str] = set()
+def _parse_package_json(package_json_blobs: list[str]) -> list[Dict[str, Any]]:
+    """Parse each package.json blob once, skipping invalid JSON and non-object documents."""
+    packages: list[Dict[str, Any]] = []
     for blob in package_json_blobs:
         try:
             data = json.loads(blob)
         except json.JSONDecodeError:
             continue
+        if isinstance(data, dict):
+            packages.append(data)
+    return packages
+
 
+def _collect_package_dependencies(packages: list[Dict[str, Any]]) -> Set[str]:
+    deps: Set[str] = set()
+    for data in packages:
         for section in ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies"):
             section_data = data.get(section) or {}
             if isinstance(section_data, dict):
@@ -35,13 +106,17 @@ def _collect_package_dependencies(package_json_blobs: list[str]) -> Set[str]:
 
 
 def detect_tech(descriptor: ProjectDescriptor) -> ProjectDescriptor:
-    """Return a new descriptor with language, framework, build_tool and tests filled based on metadata."""
+    """Return a new descriptor with language, framework, build_tool and tests filled based on metadata.
+
+    Metadata is only read, so the result shares the nested metadata structures with
+    ``descriptor`` instead of copying them.
+    """
     result = replace(
         descriptor,
         tests=list(descriptor.tests),
-        additional_metadata=deepcopy(descriptor.additional_metadata or {}),
+        additional_metadata=dict(descriptor.additional_metadata or {}),
     )
-    metadata = result.additional_metadata or {}
+    metadata = result.additional_metadata
     detected_files = metadata.get("detected_files", {})
     file_contents = metadata.get("file_contents", {})
     detected_dirs = metadata.get("detected_dirs", {})
@@ -98,127 +173,68 @@ def detect_tech(descriptor: ProjectDescriptor) -> ProjectDescriptor:
 
     # Framework detection
     if result.language in {"java", "kotlin"}:
-        java_contents = get_contents("pom.xml", "build.gradle", "build.gradle.kts")
-        if _contains_any(java_contents, ("spring-boot", "springframework", "spring.core", "spring.context")):
-            result.framework = "spring"
-        elif _contains_any(java_contents, ("micronaut",)):
-            result.framework = "micronaut"
-        elif _contains_any(java_contents, ("quarkus",)):
-            result.framework = "quarkus"
-
-        if _contains_any(java_contents, ("junit",)):
-            add_test("junit")
-        if _contains_any(java_contents, ("testng",)):
-            add_test("testng")
-        if _contains_any(java_contents, ("kotest",)):
-            add_test("kotest")
+        java_text = _lowered_text(get_contents("pom.xml", "build.gradle", "build.gradle.kts"))
+        framework = next(_matching_rules(_JAVA_FRAMEWORKS, java_text), None)
+        if framework:
+            result.framework = framework
+        for test in _matching_rules(_JAVA_TESTS, java_text):
+            add_test(test)
 
     elif result.language == "go":
         go_contents = get_contents("go.mod")
-        if _contains_any(go_contents, ("github.com/gin-gonic/gin", "github.com/gin-gonic")):
-            result.framework = "gin"
-        elif _contains_any(go_contents, ("github.com/labstack/echo", "github.com/labstack/echo/v4")):
-            result.framework = "echo"
-        elif _contains_any(go_contents, ("github.com/gofiber/fiber",)):
-            result.framework = "fiber"
-        elif _contains_any(go_contents, ("github.com/go-chi/chi",)):
-            result.framework = "chi"
-
-        if _contains_any(go_contents, ("github.com/stretchr/testify", "testify")):
-            add_test("testify")
-        if _contains_any(go_contents, ("github.com/onsi/ginkgo", "ginkgo")):
-            add_test("ginkgo")
-
-        version_match = re.search(r"\bgo\s+([0-9.]+)", " ".join(go_contents), re.IGNORECASE)
-        if version_match:
-            result.version = version_match.group(1)
+        go_text = _lowered_text(go_contents)
+        framework = next(_matching_rules(_GO_FRAMEWORKS, go_text), None)
+        if framework:
+            result.framework = framework
+        for test in _matching_rules(_GO_TESTS, go_text):
+            add_test(test)
+
+        go_version = _search_blobs(_GO_VERSION_RE, go_contents)
+        if go_version:
+            result.version = go_version
 
     elif result.language in {"js", "ts"}:
         package_contents = get_contents("package.json")
-        deps = _collect_package_dependencies(package_contents)
-        for blob in package_contents:
-            try:
-                data = json.loads(blob)
-            except json.JSONDecodeError:
-                continue
+        packages = _parse_package_json(package_contents)
+        deps = _collect_package_dependencies(packages)
+        deps_text = "\n".join(deps)
+        package_text = _lowered_text(package_contents)
+
+        engines_version = None
+        pkg_mgr_found = False
+        for data in packages:
             pkg_mgr = data.get("packageManager")
-            if isinstance(pkg_mgr, str) and pkg_mgr:
+            if not pkg_mgr_found and isinstance(pkg_mgr, str) and pkg_mgr:
                 result.package_manager = pkg_mgr.split("@", 1)[0]
-                break
-
-        def package_text_has(*keys: str) -> bool:
-            if any(any(key in dep for key in keys) for dep in deps):
-                return True
-            return _contains_any(package_contents, keys)
+                pkg_mgr_found = True
+            if engines_version is None:
+                engines = data.get("engines") or {}
+                node_version = engines.get("node")
+                if node_version:
+                    engines_version = str(node_version)
 
         if not result.framework:
-            if package_text_has("nestjs"):
-                result.framework = "nestjs"
-            elif package_text_has("next"):
-                result.framework = "next"
-            elif package_text_has("express"):
-                result.framework = "express"
-            elif package_text_has("fastify"):
-                result.framework = "fastify"
-            elif package_text_has("koa"):
-                result.framework = "koa"
-            elif package_text_has("react"):
-                result.framework = "react"
-            elif package_text_has("vue"):
-                result.framework = "vue"
-            elif package_text_has("svelte"):
-                result.framework = "svelte"
-
-        if package_text_has("jest"):
-            add_test("jest")
-        if package_text_has("mocha"):
-            add_test("mocha")
-        if package_text_has("vitest"):
-            add_test("vitest")
-        if package_text_has("ava"):
-            add_test("ava")
-        if package_text_has("tap"):
-            add_test("tap")
-        if package_text_has("cypress"):
-            add_test("cypress")
+            framework = next(_matching_rules(_NODE_FRAMEWORKS, deps_text, package_text), None)
+            if framework:
+                result.framework = framework
+        for test in _matching_rules(_NODE_TESTS, deps_text, package_text):
+            add_test(test)
 
-        engines_version = None
-        for blob in package_contents:
-            try:
-                data = json.loads(blob)
-            except json.JSONDecodeError:
-                continue
-            engines = data.get("engines") or {}
-            node_version = engines.get("node")
-            if node_version:
-                engines_version = str(node_version)
-                break
         if engines_version:
             result.version = engines_version
 
     elif result.language == "python":
         python_contents = get_contents("pyproject.toml", "requirements.txt", "pipfile")
-        if _contains_any(python_contents, ("django",)):
-            result.framework = "django"
-        elif _contains_any(python_contents, ("fastapi",)):
-            result.framework = "fastapi"
-        elif _contains_any(python_contents, ("flask",)):
-            result.framework = "flask"
-        elif _contains_any(python_contents, ("starlette",)):
-            result.framework = "starlette"
-
-        if _contains_any(python_contents, ("pytest",)):
-            add_test("pytest")
-        if _contains_any(python_contents, ("unittest", "unittest2")):
-            add_test("unittest")
-        if _contains_any(python_contents, ("nose", "nose2")):
-            add_test("nose")
-        if _contains_any(python_contents, ("tox",)):
-            add_test("tox")
-
-        py_version_match = re.search(r"python[^\n]*([0-9]+\.[0-9]+)", " ".join(python_contents), re.IGNORECASE)
-        if py_version_match:
-            result.version = py_version_match.group(1)
+        python_text = _lowered_text(python_contents)
+        framework = next(_matching_rules(_PYTHON_FRAMEWORKS, python_text), None)
+        if framework:
+            result.framework = framework
+        for test in _matching_rules(_PYTHON_TESTS, python_text):
+            add_test(test)
+
+        python_version = _search_blobs(_PYTHON_VERSION_RE, python_contents)
+        if python_version:
+            result.version = python_version
 
     # Generic directory-based test heuristics
     if not result.tests:
@@ -1,19 +1,34 @@
-"""Template rendering utilities built on Jinja2."""
+"""Template rendering utilities built on Jinja2.
+
+Jinja2 is imported lazily so CLI paths that never render (e.g. ``--help``) skip its import cost.
+"""
 
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, TYPE_CHECKING, Any, Dict, Optional
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, TemplateNotFound
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 TEMPLATES_ENV_VAR = "SELF_DEPLOY_TEMPLATES_DIR"
 
 
+def templates_overridden() -> bool:
+    """Return True when a custom templates directory has been configured."""
+    return bool(os.environ.get(TEMPLATES_ENV_VAR))
+
+
 def _templates_base_dir() -> Path:
     """Resolve the root templates directory, overridable via env var."""
-    override = os.environ.get(TEMPLATES_ENV_VAR)
+    return _resolve_templates_dir(os.environ.get(TEMPLATES_ENV_VAR))
+
+
+@lru_cache(maxsize=None)
+def _resolve_templates_dir(override: Optional[str]) -> Path:
+    """Memoised per override value so repeated renders skip the resolve()/exists() syscalls."""
     if override:
         return Path(override).expanduser().resolve()
     default_path = (Path(__file__).resolve().parent.parent / "templates").resolve()
@@ -23,22 +38,55 @@ def _templates_base_dir() -> Path:
     return cwd_path
 
 
+def _reset_templates_base_dir() -> None:
+    """Forget resolved template directories and their environments (e.g. after chdir in tests)."""
+    _resolve_templates_dir.cache_clear()
+    _environment.cache_clear()
+
+
+@lru_cache(maxsize=None)
 def _environment(base_dir: Path) -> Environment:
-    """Build a Jinja2 environment configured for file-system templates."""
+    """Build a Jinja2 environment configured for file-system templates.
+
+    Environments are cached per templates directory so compiled templates are
+    reused across renders; the bytecode cache lets later processes skip compilation.
+    """
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined
+
     return Environment(
         loader=FileSystemLoader(str(base_dir)),
         autoescape=False,
         undefined=StrictUndefined,
         keep_trailing_newline=True,
+        auto_reload=False,
+        cache_size=-1,
+        bytecode_cache=FileSystemBytecodeCache(),
     )
 
 
 def render_template(template_path: str, context: Dict[str, Any]) -> str:
-    """Render a template under the project's templates/ directory."""
+    """Render a template under the project's templates/ directory.
+
+    Missing templates (including ones pulled in via ``include``/``extends``) raise FileNotFoundError.
+    """
+    from jinja2 import TemplateNotFound
+
     base_dir = _templates_base_dir()
     env = _environment(base_dir)
     try:
         template = env.get_template(template_path)
+        return template.render(context)
+    except TemplateNotFound as exc:
+        raise FileNotFoundError(f"Template '{exc.name}' not found under {base_dir}") from exc
+
+
+def stream_template(template_path: str, context: Dict[str, Any], stream: IO[str]) -> None:
+    """Render a template straight into ``stream`` instead of building the whole string."""
+    from jinja2 import TemplateNotFound
+
+    base_dir = _templates_base_dir()
+    env = _environment(base_dir)
+    try:
+        env.get_template(template_path).stream(context).dump(stream)
     except TemplateNotFound as exc:
-        raise FileNotFoundError(f"Template '{template_path}' not found under {base_dir}") from exc
-    return template.render(**context)
+        raise FileNotFoundError(f"Template '{exc.name}' not found under {base_dir}") from exc